@@ -1,9 +1,30 @@
 #!/usr/bin/env python3
+import os
 import sys
+import json
+import logging
+import re
+import queue
+import random
 import time
 import requests
 import threading
-import RPi.GPIO as GPIO
+from concurrent.futures import ThreadPoolExecutor
+from logging.handlers import QueueHandler, QueueListener
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import lgpio
+
+# orjson is noticeably faster on the Pi; fall back to stdlib json if missing.
+# Both decoders raise a ValueError subclass on bad input.
+try:
+    import orjson
+    _json_loads = orjson.loads
+    _json_dumps = orjson.dumps
+except ImportError:
+    _json_loads = json.loads
+    def _json_dumps(obj):
+        return json.dumps(obj, separators=(",", ":")).encode()
 
 # =============================================================================
 # Configuration
@@ -18,10 +39,77 @@ ACTIVATE_RFID_URL = f"{BACKEND_BASE_URL}/rfid/activate"
 LOG_GRANTED_URL = f"{BACKEND_BASE_URL}/access-logs/granted"
 LOG_DENIED_URL = f"{BACKEND_BASE_URL}/access-logs/denied"
 
+# Unified endpoint: verifies, activates (assigned -> active) and logs the granted
+# access server-side in one round-trip. Off until the backend ships /rfid/scan;
+# a missing route returns 404, which would deny every card.
+SCAN_URL = f"{BACKEND_BASE_URL}/rfid/scan"
+USE_UNIFIED_SCAN = False
+
+GPIO_CHIP = 0  # /dev/gpiochip0 (the header GPIOs, including RP1 on recent Pi 5 kernels)
 RELAY_PIN = 17
 UNLOCK_DURATION_SECONDS = 5
+# SCHED_FIFO priority for relay timing; modest so kworker/irq threads still win.
+RT_PRIORITY = 20
+FLASH_COUNT = 6
+FLASH_INTERVAL_SECONDS = 0.15
 REQUEST_TIMEOUT = 5
-LOG_THREAD_DAEMON = True
+DEBUG = False  # log full backend responses
+LOG_POOL_WORKERS = 2
+
+# HTTP connection pool (all endpoints live on the same Railway host)
+HTTP_POOL_CONNECTIONS = 1
+HTTP_POOL_MAXSIZE = 4
+
+# One quick retry of verify/scan on connection errors / 5xx before giving up.
+HTTP_RETRIES = 1
+HTTP_RETRY_BACKOFF = 0.1  # seconds, plus up to the same again as jitter
+HTTP_RETRY_STATUSES = (500, 502, 503, 504)
+# Verify/scan use a short connect timeout so a retried lost SYN costs about
+# 2 x HTTP_CONNECT_TIMEOUT rather than 2 x REQUEST_TIMEOUT.
+HTTP_CONNECT_TIMEOUT = 1.5
+VERIFY_TIMEOUT = (HTTP_CONNECT_TIMEOUT, REQUEST_TIMEOUT)
+
+# RFID UIDs are hex strings; anything else is reader noise or a partial read.
+_UID_RE = re.compile(r"^[0-9A-Fa-f]{6,20}$")
+
+# All backend calls send a small, fixed-shape JSON body.
+JSON_HDR = {"Content-Type": "application/json"}
+
+# Recent successful verify responses, reused for quick re-taps of the same card.
+VERIFY_CACHE_TTL = 10  # seconds
+VERIFY_CACHE_MAX = 64
+
+# Circuit breaker for backend calls
+BREAKER_FAILURE_THRESHOLD = 3
+BREAKER_RESET_TIMEOUT = 30  # seconds
+
+# =============================================================================
+# Logging
+# =============================================================================
+
+# Log records are queued and written to stdout by a listener thread (started by
+# GPIOHandler), so the scan loop never blocks on console I/O.
+logger = logging.getLogger("rfid")
+logger.setLevel(logging.DEBUG if DEBUG else logging.INFO)
+logger.propagate = False
+_log_queue = queue.Queue(-1)
+logger.addHandler(QueueHandler(_log_queue))
+
+class _TagFormatter(logging.Formatter):
+    """
+    Keeps the reader's console tags: [INFO]/[WARN]/[ERROR]/[DEBUG] by level, or
+    a record's own tag (e.g. [SCAN], [DENIED]) passed via extra={"tag": ...}.
+    """
+    LEVEL_TAGS = {"WARNING": "WARN"}
+
+    def format(self, record):
+        if not getattr(record, "tag", None):
+            record.tag = self.LEVEL_TAGS.get(record.levelname, record.levelname)
+        return super().format(record)
+
+_log_stream = logging.StreamHandler(sys.stdout)
+_log_stream.setFormatter(_TagFormatter("[%(tag)s] %(message)s"))
+_log_listener = QueueListener(_log_queue, _log_stream)
 
 # =============================================================================
 # GPIO Context Manager
@@ -32,49 +120,290 @@ class GPIOHandler:
     Context manager for GPIO setup and teardown.
     """
     def __enter__(self):
-        GPIO.setwarnings(False)
-        GPIO.setmode(GPIO.BCM)
-        GPIO.setup(RELAY_PIN, GPIO.OUT, initial=GPIO.LOW)
+        _log_listener.start()
+        # Threads started later (relay timers, workers) inherit this policy.
+        try:
+            os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(RT_PRIORITY))
+        except (AttributeError, PermissionError) as e:
+            logger.warning("Could not enable SCHED_FIFO, relay timing may jitter: %s", e)
+        global _gpio_handle
+        _gpio_handle = lgpio.gpiochip_open(GPIO_CHIP)
+        lgpio.gpio_claim_output(_gpio_handle, RELAY_PIN, 0)
         return self
 
     def __exit__(self, exc_type, exc_value, traceback):
-        GPIO.cleanup()
+        global _gpio_handle
+        if _relock_timer is not None:
+            _relock_timer.cancel()
+        # Under the relay lock so a relock timer that already fired cannot write
+        # to the closed chip; it sees _gpio_handle = None and returns.
+        with _relay_lock:
+            if _gpio_handle is not None:
+                lgpio.tx_pwm(_gpio_handle, RELAY_PIN, 0, 0)
+                lgpio.gpio_write(_gpio_handle, RELAY_PIN, 0)
+                lgpio.gpio_free(_gpio_handle, RELAY_PIN)
+                lgpio.gpiochip_close(_gpio_handle)
+                _gpio_handle = None
+        # Drop queued log POSTs so exit is not held up by a backlog of requests,
+        # but let in-flight ones finish (the interpreter joins them regardless)
+        # so their results are logged before the listener stops.
+        _log_pool.shutdown(wait=True, cancel_futures=True)
         if exc_type:
-            print(f"[ERROR] Exiting due to exception: {exc_type} - {exc_value}")
+            logger.error("Exiting due to exception: %s - %s", exc_type, exc_value)
         else:
-            print("[INFO] GPIO cleanup complete.")
+            logger.info("GPIO cleanup complete.")
+        _log_listener.stop()
+
+# =============================================================================
+# Circuit Breaker
+# =============================================================================
+
+class CircuitOpenError(Exception):
+    """
+    Raised when a backend call is short-circuited by an open breaker.
+    """
+
+class CircuitBreaker:
+    """
+    Minimal CLOSED / OPEN / HALF_OPEN circuit breaker for backend calls.
+
+    After `failure_threshold` consecutive failures (connection errors or HTTP 5xx)
+    the breaker opens and rejects calls for `reset_timeout` seconds. The next call
+    after that is let through as a single trial (HALF_OPEN) while other callers
+    keep failing fast; success closes the breaker, failure opens it again.
+    """
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name, failure_threshold=BREAKER_FAILURE_THRESHOLD, reset_timeout=BREAKER_RESET_TIMEOUT):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def _before_call(self):
+        with self._lock:
+            if self.state == self.OPEN:
+                if time.monotonic() - self._opened_at < self.reset_timeout:
+                    raise CircuitOpenError(f"Backend circuit ({self.name}) is open.")
+                self.state = self.HALF_OPEN
+            if self.state == self.HALF_OPEN:
+                if self._trial_in_flight:
+                    raise CircuitOpenError(f"Backend circuit ({self.name}) is half-open.")
+                self._trial_in_flight = True
+
+    def _record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._trial_in_flight = False
+            self.state = self.CLOSED
+
+    def _record_failure(self):
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self.state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    logger.warning("Backend circuit (%s) opened; failing fast for %ss.",
+                                   self.name, self.reset_timeout)
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+
+    def call(self, fn, *args, **kwargs):
+        """
+        Calls fn(*args, **kwargs) through the breaker and returns its response.
+        Raises CircuitOpenError without calling fn while the breaker is open.
+        """
+        self._before_call()
+        try:
+            response = fn(*args, **kwargs)
+        except Exception:
+            self._record_failure()
+            raise
+        if response.status_code >= 500:
+            self._record_failure()
+        else:
+            self._record_success()
+        return response
 
 # =============================================================================
 # Network Session
 # =============================================================================
 
+class JitteredRetry(Retry):
+    """
+    urllib3 Retry that also backs off before the first retry and adds random
+    jitter, so concurrent clients don't retry in lockstep.
+    """
+    def get_backoff_time(self):
+        errors = len(self.history)
+        if errors == 0:
+            return 0
+        return self.backoff_factor * (2 ** (errors - 1)) + random.uniform(0, self.backoff_factor)
+
 session = requests.Session()  # Reuse HTTP session for efficiency
+session.headers["Connection"] = "keep-alive"
+
+# Only verify/scan are retried, and only when the request never reached the
+# backend (connect error) or the backend failed it (5xx). Read errors are not
+# retried: the POST may already have been processed, and a second full timeout
+# would stall the scan loop. Retry-After is ignored for the same reason. With
+# raise_on_status off, a final 5xx is returned and handled as before.
+retry = JitteredRetry(
+    total=HTTP_RETRIES,
+    read=0,
+    backoff_factor=HTTP_RETRY_BACKOFF,
+    status_forcelist=HTTP_RETRY_STATUSES,
+    allowed_methods=frozenset(["POST"]),
+    respect_retry_after_header=False,
+    raise_on_status=False
+)
+
+# verify -> activate -> log all hit the same host, so a single small pool
+# lets every request of a scan reuse one TLS socket.
+adapter = HTTPAdapter(
+    pool_connections=HTTP_POOL_CONNECTIONS,
+    pool_maxsize=HTTP_POOL_MAXSIZE,
+    pool_block=False
+)
+session.mount("https://", adapter)
+session.mount("http://", adapter)
+
+# Verify/scan get the retry policy through their own adapter, which shares the
+# pool above so they still reuse the same keep-alive socket.
+verify_adapter = HTTPAdapter(max_retries=retry)
+verify_adapter.poolmanager = adapter.poolmanager
+session.mount(VERIFY_RFID_URL, verify_adapter)
+session.mount(SCAN_URL, verify_adapter)
+
+# Bounded worker pool for background backend calls (activation, access logging).
+_log_pool = ThreadPoolExecutor(max_workers=LOG_POOL_WORKERS, thread_name_prefix="rfid-log")
+
+# Breakers for the Railway backend: one for verify/scan, which gates access, and
+# one for background activation/log POSTs, so a failing log endpoint cannot make
+# validate_rfid deny valid cards.
+breaker = CircuitBreaker("verify")
+background_breaker = CircuitBreaker("background")
+
+# rfid_uid -> (monotonic time verified, backend response). Only touched by the
+# main loop; insertion order gives FIFO eviction.
+_verify_cache = {}
+
+# =============================================================================
+# Relay State
+# =============================================================================
+
+# Serializes relay writes between the main thread and the relock timer.
+_relay_lock = threading.Lock()
+# Monotonic time at which the door should lock again; later scans push it out.
+_relock_at = 0.0
+_relock_timer = None
+
+# lgpio chip handle, opened by GPIOHandler.
+_gpio_handle = None
 
 # =============================================================================
 # Helper Functions
 # =============================================================================
 
+def _uid_body(rfid_uid):
+    """
+    Returns the encoded {"rfid_uid": ...} request body.
+    """
+    return b'{"rfid_uid":' + _json_dumps(rfid_uid) + b'}'
+
+def _post(url, body, cb=breaker, timeout=REQUEST_TIMEOUT):
+    """
+    POSTs a pre-encoded JSON body to the backend through circuit breaker cb.
+    """
+    return cb.call(session.post, url, data=body, headers=JSON_HDR, timeout=timeout)
+
+def _log_background_error(future):
+    """
+    Done-callback for _log_pool jobs: logs exceptions nobody else would see.
+    """
+    if not future.cancelled() and future.exception() is not None:
+        logger.error("Background task failed: %r", future.exception(), exc_info=future.exception())
+
+def _submit_background(fn, *args):
+    """
+    Runs fn(*args) on the background pool, logging any unexpected exception.
+    """
+    _log_pool.submit(fn, *args).add_done_callback(_log_background_error)
+
+def _warm_connection():
+    """
+    Opens the pooled keep-alive connection (DNS + TCP + TLS) ahead of the first scan.
+    """
+    try:
+        session.head(BACKEND_BASE_URL, timeout=REQUEST_TIMEOUT)
+        logger.info("Backend connection warmed up.")
+    except requests.exceptions.RequestException as e:
+        logger.warning("Backend warm-up failed: %s", e)
+
+def _arm_relock(delay):
+    """
+    Replaces the relock timer with one firing after delay seconds.
+    Caller must hold _relay_lock.
+    """
+    global _relock_timer
+    if _relock_timer is not None:
+        _relock_timer.cancel()
+    _relock_timer = threading.Timer(delay, _relock_door)
+    _relock_timer.daemon = True
+    _relock_timer.start()
+
+def _relock_door():
+    """
+    Timer callback: locks the door once _relock_at has passed. If the timer
+    woke early (Timer waits on the wall clock before Python 3.11, so an NTP step
+    can end it early), it re-arms for the remaining time instead of leaving the
+    door unlocked.
+    """
+    with _relay_lock:
+        # A timer replaced by a later scan may still run if it had already fired.
+        if _gpio_handle is None or threading.current_thread() is not _relock_timer:
+            return
+        remaining = _relock_at - time.monotonic()
+        if remaining > 0:
+            _arm_relock(remaining)
+            return
+        lgpio.gpio_write(_gpio_handle, RELAY_PIN, 0)
+    logger.info("Door locked.")
+
 def unlock_door():
     """
-    Unlocks the door (sets relay HIGH) for UNLOCK_DURATION_SECONDS.
+    Unlocks the door (sets relay HIGH) for UNLOCK_DURATION_SECONDS without blocking.
+    A scan during an active unlock extends it rather than cutting it short.
     """
-    print("[INFO] Unlocking door...")
-    GPIO.output(RELAY_PIN, GPIO.HIGH)
-    time.sleep(UNLOCK_DURATION_SECONDS)
-    GPIO.output(RELAY_PIN, GPIO.LOW)
-    print("[INFO] Door locked.")
+    global _relock_at
+    logger.info("Unlocking door...")
+    with _relay_lock:
+        # Always stop any denial flash: lgpio's pulse thread can outlast a
+        # Python-side estimate, and its last falling edge would re-lock the door.
+        lgpio.tx_pwm(_gpio_handle, RELAY_PIN, 0, 0)
+        lgpio.gpio_write(_gpio_handle, RELAY_PIN, 1)
+        _relock_at = time.monotonic() + UNLOCK_DURATION_SECONDS
+        _arm_relock(UNLOCK_DURATION_SECONDS)
 
-def flash_relay(flash_count=6, interval=0.15):
+def flash_relay(flash_count=FLASH_COUNT, interval=FLASH_INTERVAL_SECONDS):
     """
-    Flashes the relay to indicate ACCESS DENIED.
+    Flashes the relay to indicate ACCESS DENIED without blocking.
+    Skipped while the door is unlocked so a denial cannot re-lock it early.
     """
-    print("[WARN] Flashing relay for access denial.")
-    for _ in range(flash_count):
-        GPIO.output(RELAY_PIN, GPIO.HIGH)
-        time.sleep(interval)
-        GPIO.output(RELAY_PIN, GPIO.LOW)
-        time.sleep(interval)
-    print("[WARN] Access denial flash complete.")
+    with _relay_lock:
+        if time.monotonic() < _relock_at:
+            logger.warning("Door is unlocked; skipping denial flash.")
+            return
+        logger.warning("Flashing relay for access denial.")
+        # 50% duty: one PWM period is one on + off interval. lgpio stops after
+        # exactly flash_count pulses, leaving the relay LOW.
+        lgpio.tx_pwm(_gpio_handle, RELAY_PIN, 1 / (2 * interval), 50, 0, flash_count)
 
 def log_access_attempt(endpoint, payload, success_message):
     """
@@ -82,21 +411,22 @@ def log_access_attempt(endpoint, payload, success_message):
     """
     def log_worker():
         try:
-            response = session.post(endpoint, json=payload, timeout=REQUEST_TIMEOUT)
+            response = _post(endpoint, _json_dumps(payload), background_breaker)
             if response.status_code == 201:
-                print(f"[INFO] {success_message}")
+                logger.info(success_message)
             else:
-                print(f"[ERROR] Logging failed: HTTP {response.status_code}")
+                logger.error("Logging failed: HTTP %s", response.status_code)
+        except CircuitOpenError:
+            logger.warning("Logging skipped: backend circuit open.")
         except requests.exceptions.RequestException as e:
-            print(f"[ERROR] Logging request exception: {e}")
-    t = threading.Thread(target=log_worker, daemon=LOG_THREAD_DAEMON)
-    t.start()
+            logger.error("Logging request exception: %s", e)
+    _submit_background(log_worker)
 
 def deny_access(rfid_uid, reason="Unknown reason"):
     """
     Denies access: flashes relay, logs the denial, and prints the reason.
     """
-    print(f"[DENIED] ACCESS DENIED: {reason}")
+    logger.warning("ACCESS DENIED: %s", reason, extra={"tag": "DENIED"})
     flash_relay()
     log_access_attempt(
         LOG_DENIED_URL,
@@ -104,6 +434,24 @@ def deny_access(rfid_uid, reason="Unknown reason"):
         "Access denied logged successfully."
     )
 
+def _get_cached_verify(rfid_uid):
+    """
+    Returns the cached verify response for rfid_uid if still fresh, else None.
+    """
+    ts, data = _verify_cache.get(rfid_uid, (0.0, None))
+    if data is not None and time.monotonic() - ts < VERIFY_CACHE_TTL:
+        return data
+    return None
+
+def _cache_verify(rfid_uid, data):
+    """
+    Stores a successful verify response, evicting the oldest entry when full.
+    """
+    _verify_cache.pop(rfid_uid, None)
+    _verify_cache[rfid_uid] = (time.monotonic(), data)
+    if len(_verify_cache) > VERIFY_CACHE_MAX:
+        del _verify_cache[next(iter(_verify_cache))]
+
 def activate_rfid_if_assigned(rfid_uid, rfid_status):
     """
     If the RFID status is 'assigned', calls the backend to activate it (status -> 'active').
@@ -112,131 +460,174 @@ def activate_rfid_if_assigned(rfid_uid, rfid_status):
     if rfid_status != "assigned":
         return rfid_status
 
-    print("[INFO] RFID status is 'assigned'. Attempting to activate...")
+    logger.info("RFID status is 'assigned'. Attempting to activate...")
     try:
-        response = session.post(
-            ACTIVATE_RFID_URL,
-            json={"rfid_uid": rfid_uid},
-            timeout=REQUEST_TIMEOUT
-        )
+        response = _post(ACTIVATE_RFID_URL, _uid_body(rfid_uid), background_breaker)
         if response.status_code == 200:
-            data = response.json()
+            data = _json_loads(response.content)
             if data.get("success"):
-                updatedRFID = data.get("data", {})
+                updatedRFID = data.get("data") or {}
                 newStatus = updatedRFID.get("status", "unknown")
-                print(f"[INFO] RFID {rfid_uid} successfully activated (status={newStatus}).")
+                logger.info("RFID %s successfully activated (status=%s).", rfid_uid, newStatus)
                 return newStatus
             else:
-                print(f"[ERROR] Could not activate RFID {rfid_uid}: {data.get('message')}")
+                logger.error("Could not activate RFID %s: %s", rfid_uid, data.get("message"))
                 return None
         else:
-            print(f"[ERROR] Unexpected HTTP {response.status_code} activating RFID.")
+            logger.error("Unexpected HTTP %s activating RFID.", response.status_code)
             return None
+    except CircuitOpenError:
+        logger.error("Backend circuit open; skipping RFID activation.")
+        return None
     except requests.exceptions.RequestException as e:
-        print(f"[ERROR] Cannot connect to backend to activate RFID: {e}")
+        logger.error("Cannot connect to backend to activate RFID: %s", e)
         return None
 
 def validate_rfid(rfid_uid):
     """
-    1) Calls /rfid/verify to check if the RFID and room are valid.
-    2) If success, activates the RFID if needed (assigned -> active) and unlocks the door.
+    0) Re-taps within VERIFY_CACHE_TTL of a successful verify unlock straight away.
+    1) Calls /rfid/scan (or /rfid/verify when USE_UNIFIED_SCAN is off) to check
+       if the RFID and room are valid.
+    2) If success, unlocks the door. With the unified endpoint the backend has
+       already activated the RFID and logged the access; otherwise the RFID is
+       activated in the background if needed (assigned -> active) and the
+       granted access is logged.
     3) Denies access if the backend returns success: false.
     """
-    print(f"[INFO] Sending verification request for RFID={rfid_uid}...")
+    cached = _get_cached_verify(rfid_uid)
+    if cached is not None:
+        # Re-tap within VERIFY_CACHE_TTL: skip the backend round-trip.
+        logger.info("RFID Verified (cached): %s", rfid_uid)
+        unlock_door()
+        guest_id = ((cached.get("data") or {}).get("guest") or {}).get("id")
+        payload = {"rfid_uid": rfid_uid, "guest_id": guest_id}
+        log_access_attempt(LOG_GRANTED_URL, payload, "Access granted logged successfully.")
+        return
+
+    logger.info("Sending verification request for RFID=%s...", rfid_uid)
     try:
-        response = session.post(
-            VERIFY_RFID_URL,
-            json={"rfid_uid": rfid_uid},
-            timeout=REQUEST_TIMEOUT
+        response = _post(
+            SCAN_URL if USE_UNIFIED_SCAN else VERIFY_RFID_URL,
+            _uid_body(rfid_uid),
+            timeout=VERIFY_TIMEOUT
         )
+    except CircuitOpenError:
+        deny_access(rfid_uid, "backend circuit open")
+        return
     except requests.exceptions.RequestException as e:
-        print(f"[ERROR] Cannot connect to backend: {e}")
+        logger.error("Cannot connect to backend: %s", e)
         return
 
     if response.status_code == 200:
         try:
-            data = response.json()
+            data = _json_loads(response.content)
         except ValueError as e:
-            print(f"[ERROR] JSON parse error: {e}")
+            logger.error("JSON parse error: %s", e)
             deny_access(rfid_uid, "Backend JSON parse error.")
             return
 
-        print(f"[DEBUG] Full backend response: {data}")
+        logger.debug("Full backend response: %s", data)
 
         if not data.get("success"):
             deny_access(rfid_uid, data.get("message", "Unknown backend error."))
             return
 
-        # Extract details
-        var_data = data.get("data", {})
-        rfid_data  = var_data.get("rfid", {})
-        guest_info = var_data.get("guest", {})
-        var_room   = var_data.get("room")
+        _cache_verify(rfid_uid, data)
 
-        # If room info is None, assign an empty dictionary to avoid errors
-        room_info = var_room if var_room is not None else {}
+        # Extract details once (data/rfid/guest/room may be missing or None)
+        var_data = data.get("data") or {}
+        current_status = (var_data.get("rfid") or {}).get("status")
+        guest_info = var_data.get("guest") or {}
+        room_info = var_data.get("room") or {}
+        guest_id = guest_info.get("id")
 
-        print(f"[INFO] RFID Verified: {rfid_uid}")
+        logger.info("RFID Verified: %s", rfid_uid)
 
         if guest_info:
-            print(f"[INFO] Guest Info => ID={guest_info.get('id')}, Name={guest_info.get('name')}")
+            logger.info("Guest Info => ID=%s, Name=%s", guest_id, guest_info.get("name"))
         else:
-            print("[WARN] No guest info provided by backend.")
+            logger.warning("No guest info provided by backend.")
 
         # Only print room info if available; otherwise, log a warning.
         if room_info:
-            print("[INFO] Room Info => "
-                  f"ID={room_info.get('id')}, "
-                  f"Number={room_info.get('room_number')}, "
-                  f"Status={room_info.get('status')}, "
-                  f"check_in={room_info.get('check_in')}, "
-                  f"check_out={room_info.get('check_out')}")
+            logger.info("Room Info => ID=%s, Number=%s, Status=%s, check_in=%s, check_out=%s",
+                        room_info.get("id"),
+                        room_info.get("room_number"),
+                        room_info.get("status"),
+                        room_info.get("check_in"),
+                        room_info.get("check_out"))
         else:
-            print("[WARN] No room info provided by backend.")
+            logger.warning("No room info provided by backend.")
 
-        # Activate RFID if still assigned.
-        current_status = rfid_data.get("status")
-        updated_status = activate_rfid_if_assigned(rfid_uid, current_status)
-        if updated_status is None:
-            deny_access(rfid_uid, f"RFID {rfid_uid} could not be activated.")
+        if USE_UNIFIED_SCAN:
+            # Activation and granted log were handled by the backend.
+            unlock_door()
             return
 
+        # Activate RFID in the background if still assigned. Verification has
+        # already granted access, so the unlock does not wait on activation; a
+        # failed activation is reported by the worker and retried on the next
+        # scan, whose verify will still see the RFID as 'assigned'.
+        if current_status == "assigned":
+            _submit_background(activate_rfid_if_assigned, rfid_uid, current_status)
+
         # Unlock the door.
         unlock_door()
 
         # Log successful access.
-        payload = {
-            "rfid_uid": rfid_uid,
-            "guest_id": guest_info.get("id") if guest_info else None
-        }
+        payload = {"rfid_uid": rfid_uid, "guest_id": guest_id}
         log_access_attempt(LOG_GRANTED_URL, payload, "Access granted logged successfully.")
 
     elif response.status_code in (403, 404):
         try:
-            reason = response.json().get("message", "No detail provided")
+            reason = _json_loads(response.content).get("message", "No detail provided")
         except ValueError:
             reason = "No detail provided"
         deny_access(rfid_uid, reason)
     else:
-        print(f"[ERROR] Unexpected backend response: HTTP {response.status_code}")
+        logger.error("Unexpected backend response: HTTP %s", response.status_code)
         deny_access(rfid_uid, f"Unexpected status {response.status_code}")
 
+def _reader_loop(scan_queue):
+    """
+    Reads scans from stdin into scan_queue so they are buffered while the main
+    loop is busy. Puts None on EOF.
+    """
+    readline = sys.stdin.buffer.readline
+    while True:
+        line = readline()
+        if not line:
+            break
+        # UIDs are ASCII hex; non-ASCII noise is dropped and caught by _UID_RE.
+        scan_queue.put(line.strip().decode("ascii", "ignore"))
+    scan_queue.put(None)
+
 def main():
-    print("[INFO] RFID Reader is active. Waiting for scans (Ctrl+C to exit).")
+    logger.info("RFID Reader is active. Waiting for scans (Ctrl+C to exit).")
+    scan_queue = queue.Queue()
+    threading.Thread(target=_reader_loop, args=(scan_queue,), daemon=True).start()
     try:
         while True:
-            rfid_uid = input().strip()
+            rfid_uid = scan_queue.get()
+            if rfid_uid is None:
+                logger.info("Input closed.")
+                break
             if not rfid_uid:
                 continue
-            print(f"[SCAN] RFID Scanned: {rfid_uid}")
+            logger.info("RFID Scanned: %s", rfid_uid, extra={"tag": "SCAN"})
+            if not _UID_RE.match(rfid_uid):
+                logger.warning("Malformed RFID UID, not sent to backend: %r", rfid_uid)
+                flash_relay()
+                continue
             validate_rfid(rfid_uid)
     except KeyboardInterrupt:
-        print("\n[INFO] Exiting RFID reader gracefully...")
+        logger.info("Exiting RFID reader gracefully...")
     except Exception as e:
-        print(f"[ERROR] Unexpected error: {e}")
+        logger.error("Unexpected error: %s", e)
     finally:
         sys.exit(0)
 
 if __name__ == "__main__":
+    threading.Thread(target=_warm_connection, daemon=True).start()
     with GPIOHandler():
         main()